@@ -21,6 +21,8 @@ const els = {
   stateList: document.getElementById("stateList"),
   consensusText: document.getElementById("consensusText"),
   logText: document.getElementById("logText"),
+  logSpacer: document.getElementById("logSpacer"),
+  logWindow: document.getElementById("logWindow"),
   rawText: document.getElementById("rawText"),
 
   btnRefresh: document.getElementById("btnRefresh"),
@@ -32,8 +34,27 @@ const els = {
   refreshInterval: document.getElementById("refreshInterval"),
 };
 
+const LOG_LINE_HEIGHT = 18;
+const LOG_OVERSCAN = 40;
+const LOG_MAX_LINES = 200000;
+const LOG_HISTORY_LINES = 5000;
+
+const STALE_RETRY_MS = 2000;
+
 let timer = null;
+let staleRetry = null;
 let rawVisible = false;
+let rawPending = "";
+
+const renderedHashes = new Map();
+let consensusJob = null;
+
+const logView = {
+  lines: [],
+  start: -1,
+  end: -1,
+  frame: null,
+};
 
 function escapeHtml(text) {
   return String(text)
@@ -137,6 +158,152 @@ function renderMarkdown(md) {
   return out.join("");
 }
 
+function hashText(text) {
+  // 32-bit FNV-1a; cheap enough to run on every poll.
+  let hash = 0x811c9dc5;
+  const str = String(text);
+  for (let i = 0; i < str.length; i += 1) {
+    hash ^= str.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return `${str.length}:${hash >>> 0}`;
+}
+
+function changedSince(key, text) {
+  const hash = hashText(text);
+  if (renderedHashes.get(key) === hash) return false;
+  renderedHashes.set(key, hash);
+  return true;
+}
+
+function setText(el, text) {
+  if (el.textContent !== text) {
+    el.textContent = text;
+  }
+}
+
+function whenIdle(fn) {
+  if (typeof window.requestIdleCallback === "function") {
+    const id = window.requestIdleCallback(fn, { timeout: 1000 });
+    return () => window.cancelIdleCallback(id);
+  }
+  const id = setTimeout(fn, 0);
+  return () => clearTimeout(id);
+}
+
+function renderConsensus(md) {
+  if (!changedSince("consensus", md)) return;
+  if (consensusJob) consensusJob();
+  consensusJob = whenIdle(() => {
+    consensusJob = null;
+    els.consensusText.innerHTML = renderMarkdown(md);
+  });
+}
+
+function renderRaw(text) {
+  rawPending = text;
+  if (!rawVisible) return;
+  if (changedSince("raw", text)) {
+    els.rawText.textContent = text;
+  }
+}
+
+function splitLines(text) {
+  const rows = String(text || "").replace(/\r\n?/g, "\n").split("\n");
+  if (rows.length && rows[rows.length - 1] === "") rows.pop();
+  return rows;
+}
+
+function tailOverlap(lines, tail) {
+  // Largest k where the last k buffered lines equal the first k tail lines.
+  const max = Math.min(lines.length, tail.length);
+  for (let k = max; k > 0; k -= 1) {
+    const offset = lines.length - k;
+    let match = true;
+    for (let i = 0; i < k; i += 1) {
+      if (lines[offset + i] !== tail[i]) {
+        match = false;
+        break;
+      }
+    }
+    if (match) return k;
+  }
+  return 0;
+}
+
+function logAtBottom() {
+  const view = els.logText;
+  return view.scrollTop + view.clientHeight >= view.scrollHeight - LOG_LINE_HEIGHT * 2;
+}
+
+function setLogLines(rows) {
+  logView.lines = rows.slice(-LOG_MAX_LINES);
+  renderedHashes.delete("logTail");
+  refreshLogView(true);
+}
+
+function appendLogTail(text) {
+  if (!changedSince("logTail", text)) return;
+  const tail = splitLines(text);
+  if (!logView.lines.length) {
+    logView.lines = tail;
+    refreshLogView(true);
+    return;
+  }
+
+  const overlap = tailOverlap(logView.lines, tail);
+  const fresh = tail.slice(overlap);
+  if (!fresh.length) return;
+  if (overlap === 0) {
+    logView.lines.push("-- log gap (rotated or fell behind the tail window) --");
+  }
+
+  const stick = logAtBottom();
+  for (const row of fresh) logView.lines.push(row);
+  if (logView.lines.length > LOG_MAX_LINES * 1.1) {
+    logView.lines.splice(0, logView.lines.length - LOG_MAX_LINES);
+  }
+  refreshLogView(stick);
+}
+
+function refreshLogView(scrollToBottom) {
+  const total = Math.max(logView.lines.length, 1);
+  els.logSpacer.style.height = `${total * LOG_LINE_HEIGHT}px`;
+  logView.start = -1;
+  if (scrollToBottom) {
+    els.logText.scrollTop = els.logText.scrollHeight;
+  }
+  renderLogWindow();
+}
+
+function renderLogWindow() {
+  logView.frame = null;
+  const view = els.logText;
+  const lines = logView.lines.length ? logView.lines : ["(no logs yet)"];
+  const first = Math.floor(view.scrollTop / LOG_LINE_HEIGHT);
+  const visible = Math.ceil(view.clientHeight / LOG_LINE_HEIGHT);
+  const start = Math.max(0, first - LOG_OVERSCAN);
+  const end = Math.min(lines.length, first + visible + LOG_OVERSCAN);
+  if (start === logView.start && end === logView.end) return;
+
+  logView.start = start;
+  logView.end = end;
+  els.logWindow.style.transform = `translateY(${start * LOG_LINE_HEIGHT}px)`;
+  els.logWindow.textContent = lines.slice(start, end).join("\n");
+}
+
+function scheduleLogWindow() {
+  if (logView.frame === null) {
+    logView.frame = requestAnimationFrame(renderLogWindow);
+  }
+}
+
+async function reloadLogHistory() {
+  const res = await fetch(`/api/log-tail?lines=${LOG_HISTORY_LINES}`, { cache: "no-store" });
+  const data = await res.json();
+  setLogLines(splitLines(data.logTail || ""));
+}
+
 function classForState(kind, state) {
   if (kind === "daemon") {
     if (state === "active") return "good";
@@ -186,9 +353,12 @@ function renderStateList(parsed, stateFile) {
     ["Daemon SubState", parsed.daemon.subState || "-"],
   ];
 
-  els.stateList.innerHTML = rows
-    .map(([k, v]) => `<div><dt>${k}</dt><dd>${String(v)}</dd></div>`)
+  const html = rows
+    .map(([k, v]) => `<div><dt>${k}</dt><dd>${escapeHtml(v)}</dd></div>`)
     .join("");
+  if (changedSince("stateList", html)) {
+    els.stateList.innerHTML = html;
+  }
 }
 
 async function fetchStatus() {
@@ -203,37 +373,52 @@ async function fetchStatus() {
   const loop = parsed.loop || {};
   const autostart = parsed.autostart || {};
 
-  els.guardianState.textContent = (guardian.state || "unknown").toUpperCase();
-  els.guardianMeta.textContent = guardian.pid ? `PID ${guardian.pid}` : "PID --";
+  setText(els.guardianState, (guardian.state || "unknown").toUpperCase());
+  setText(els.guardianMeta, guardian.pid ? `PID ${guardian.pid}` : "PID --");
   applyCardState(els.cardGuardian, "guardian", guardian.state);
 
-  els.daemonState.textContent = (daemon.state || "unknown").toUpperCase();
-  els.daemonMeta.textContent = daemon.mainPid ? `MainPID ${daemon.mainPid}` : "MainPID --";
+  setText(els.daemonState, (daemon.state || "unknown").toUpperCase());
+  setText(els.daemonMeta, daemon.mainPid ? `MainPID ${daemon.mainPid}` : "MainPID --");
   applyCardState(els.cardDaemon, "daemon", daemon.state);
 
-  els.loopState.textContent = (loop.state || "unknown").toUpperCase();
+  setText(els.loopState, (loop.state || "unknown").toUpperCase());
   const loopCycle = loop.loopCount ? `Cycle ${loop.loopCount}` : "Cycle --";
   const loopPid = loop.pid ? `PID ${loop.pid}` : "PID --";
-  els.loopMeta.textContent = `${loopCycle} | ${loopPid}`;
+  setText(els.loopMeta, `${loopCycle} | ${loopPid}`);
   applyCardState(els.cardLoop, "loop", loop.state);
 
-  els.autostartState.textContent = (autostart.state || "unknown").toUpperCase();
-  els.autostartMeta.textContent = autostart.raw || "Autostart";
+  setText(els.autostartState, (autostart.state || "unknown").toUpperCase());
+  setText(els.autostartMeta, autostart.raw || "Autostart");
   applyCardState(els.cardAutostart, "autostart", autostart.state);
 
   renderStateList(parsed, data.stateFile || {});
 
-  const consensusRaw = (data.consensusHead || parsed.consensusPreview || "(no consensus)").trim();
-  els.consensusText.innerHTML = renderMarkdown(consensusRaw);
-  els.logText.textContent = (data.logTail || parsed.recentLog || "(no logs yet)").trim();
-  els.rawText.textContent = data.raw || "";
+  renderConsensus((data.consensusHead || parsed.consensusPreview || "(no consensus)").trim());
+  // Untrimmed, so leading blank lines still line up with the buffered log.
+  appendLogTail(data.logTail || parsed.recentLog || "");
+  renderRaw(data.raw || "");
 
   const healthy = data.ok && loop.state === "running" && daemon.state === "active";
-  els.pulseText.textContent = healthy ? "Live Link: STABLE" : "Live Link: ATTENTION";
+  setText(els.pulseText, healthy ? "Live Link: STABLE" : "Live Link: ATTENTION");
   els.pulseDot.style.background = healthy ? "var(--good)" : "var(--warn)";
 
-  els.lastUpdate.textContent = `Last update: ${formatTime(data.timestamp)}`;
-  els.latency.textContent = `Roundtrip: ${elapsed}ms`;
+  let staleNote = "";
+  if (data.error) {
+    const age = data.staleAgeSeconds ?? null;
+    staleNote = age === null ? ` (refresh failed: ${data.error})` : ` (stale, ${age}s old; refresh failed: ${data.error})`;
+  } else if (data.stale) {
+    staleNote = ` (stale, ${data.staleAgeSeconds ?? "?"}s old, refreshing)`;
+  }
+  setText(els.lastUpdate, `Last update: ${formatTime(data.timestamp)}${staleNote}`);
+  setText(els.latency, `Roundtrip: ${elapsed}ms`);
+
+  // A failed refresh waits for the normal interval instead of hammering a frozen script.
+  if (data.stale && !data.error && staleRetry === null) {
+    staleRetry = setTimeout(() => {
+      staleRetry = null;
+      fetchStatus().catch(() => {});
+    }, STALE_RETRY_MS);
+  }
 }
 
 async function runAction(action) {
@@ -264,6 +449,7 @@ function resetAutoTimer() {
   }
   if (els.autoToggle.checked) {
     timer = setInterval(() => {
+      if (document.hidden) return;
       fetchStatus().catch(() => {});
     }, Number(els.refreshInterval.value));
   }
@@ -272,16 +458,25 @@ function resetAutoTimer() {
 els.btnRefresh.addEventListener("click", () => fetchStatus().catch(() => {}));
 els.btnStart.addEventListener("click", () => runAction("start"));
 els.btnStop.addEventListener("click", () => runAction("stop"));
-els.btnTail.addEventListener("click", () => fetchStatus().catch(() => {}));
+els.btnTail.addEventListener("click", () => reloadLogHistory().catch(() => {}));
 els.btnRaw.addEventListener("click", () => {
   rawVisible = !rawVisible;
   els.rawText.classList.toggle("hidden", !rawVisible);
+  renderRaw(rawPending);
 });
 els.autoToggle.addEventListener("change", resetAutoTimer);
 els.refreshInterval.addEventListener("change", resetAutoTimer);
+els.logText.addEventListener("scroll", scheduleLogWindow, { passive: true });
+window.addEventListener("resize", scheduleLogWindow);
+document.addEventListener("visibilitychange", () => {
+  if (!document.hidden && els.autoToggle.checked) {
+    fetchStatus().catch(() => {});
+  }
+});
 
 fetchStatus().catch((err) => {
   const msg = err instanceof Error ? err.message : String(err);
+  rawPending = msg;
   els.rawText.textContent = msg;
 });
 resetAutoTimer();
@@ -4,17 +4,25 @@
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import os
 import platform
+import queue
 import re
+import shlex
+import shutil
+import signal
 import subprocess
+import tempfile
+import threading
 import time
+import uuid
 from datetime import datetime, timezone
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import parse_qs, urlparse
 
 
@@ -32,10 +40,20 @@ MACOS_STOP_SCRIPT = REPO_ROOT / "scripts" / "core" / "stop-loop.sh"
 LOG_FILE = REPO_ROOT / "logs" / "auto-loop.log"
 STATE_FILE = REPO_ROOT / ".auto-loop-state"
 CONSENSUS_FILE = REPO_ROOT / "memories" / "consensus.md"
+STATUS_SNAPSHOT_FILE = REPO_ROOT / "logs" / "dashboard-status.json"
+# A payload this recent is served as-is. Matches the fastest dashboard poll
+# interval and covers the stale retry that follows a warm-start refresh.
+STATUS_FRESH_SECONDS = 3.0
 
 WINDOWS_HOST = "windows"
 MACOS_HOST = "macos"
 
+BASH_WORKER = "bash"
+POWERSHELL_WORKER = "powershell"
+STATUS_LANE = "status"
+ACTION_LANE = "action"
+WORKER_SENTINEL = "__AUTO_COMPANY_WORKER_DONE__"
+
 
 def ps_quote(value: str) -> str:
     return "'" + value.replace("'", "''") + "'"
@@ -52,84 +70,301 @@ def detect_host_kind(system_name: str | None = None) -> str:
     )
 
 
-def run_powershell_script(
-    script_path: Path, args: list[str] | None = None, timeout: int = 90
-) -> dict[str, Any]:
+def bash_worker_request(
+    script_path: Path, args: list[str], token: str, output_path: Path
+) -> str:
+    # Source the script in a forked subshell so no new interpreter is exec'd.
+    # Output goes to a per-request file, so anything the script leaves running
+    # in the background cannot write into a later request's result.
+    positional = " ".join(shlex.quote(arg) for arg in args)
+    return (
+        f"( cd {shlex.quote(str(REPO_ROOT))} && set -- {positional} && "
+        f". {shlex.quote(str(script_path))} ) "
+        f">{shlex.quote(str(output_path))} 2>&1 </dev/null; "
+        f"printf '\\n{WORKER_SENTINEL} {token} %d\\n' \"$?\"\n"
+    )
+
+
+def powershell_worker_request(
+    script_path: Path, args: list[str], token: str, output_path: Path
+) -> str:
     invocation = f"& {ps_quote(str(script_path))}"
     if args:
         invocation += " " + " ".join(ps_quote(arg) for arg in args)
+    # Runs inside a fresh runspace, so $global: state and imported modules
+    # from one script never leak into the next.
+    inner = "\n".join(
+        [
+            "$ErrorActionPreference = 'Stop'",
+            f"Set-Location -LiteralPath {ps_quote(str(REPO_ROOT))}",
+            "$global:LASTEXITCODE = 0",
+            f"try {{ $text = ({invocation} *>&1 | Out-String); $code = $LASTEXITCODE }}",
+            "catch { $text = ($_ | Out-String); $code = 1 }",
+            f"[IO.File]::WriteAllText({ps_quote(str(output_path))}, $text, "
+            "(New-Object System.Text.UTF8Encoding $false))",
+            "$code",
+        ]
+    )
+    # Environment variables are process-wide, so they are snapshotted and
+    # restored around each run.
+    command = "\n".join(
+        [
+            "$acEnv = [Environment]::GetEnvironmentVariables()",
+            "$acPs = [PowerShell]::Create()",
+            "try {",
+            f"    $null = $acPs.AddScript({ps_quote(inner)})",
+            "    $acResult = $acPs.Invoke()",
+            "    $acCode = if ($acResult.Count -gt 0) { [int]$acResult[$acResult.Count - 1] } else { 1 }",
+            "} catch {",
+            f"    [IO.File]::WriteAllText({ps_quote(str(output_path))}, ($_ | Out-String))",
+            "    $acCode = 1",
+            "} finally {",
+            "    $acPs.Dispose()",
+            "    $acNow = [Environment]::GetEnvironmentVariables()",
+            "    foreach ($acKey in @($acNow.Keys)) {",
+            "        if (-not $acEnv.Contains($acKey)) { [Environment]::SetEnvironmentVariable($acKey, $null) }",
+            "    }",
+            "    foreach ($acKey in @($acEnv.Keys)) {",
+            "        if ($acNow[$acKey] -ne $acEnv[$acKey]) { [Environment]::SetEnvironmentVariable($acKey, $acEnv[$acKey]) }",
+            "    }",
+            "}",
+            f"[Console]::Out.WriteLine(\"`n{WORKER_SENTINEL} {token} $acCode\")",
+            "[Console]::Out.Flush()",
+        ]
+    )
+    # `-Command -` decodes stdin with the console code page, so only ASCII may
+    # cross the pipe; non-ASCII paths and args travel inside the base64 payload.
+    encoded = base64.b64encode(command.encode("utf-8")).decode("ascii")
+    return (
+        "iex ([Text.Encoding]::UTF8.GetString("
+        f"[Convert]::FromBase64String('{encoded}')))\n"
+    )
+
 
-    cmd = [
-        "powershell",
-        "-NoProfile",
-        "-ExecutionPolicy",
-        "Bypass",
-        "-Command",
-        (
+WORKER_SPECS: dict[str, dict[str, Any]] = {
+    BASH_WORKER: {
+        "cmd": ["/bin/bash", "--noprofile", "--norc"],
+        "init": "",
+        "request": bash_worker_request,
+    },
+    POWERSHELL_WORKER: {
+        "cmd": [
+            "powershell",
+            "-NoProfile",
+            "-NonInteractive",
+            "-ExecutionPolicy",
+            "Bypass",
+            "-Command",
+            "-",
+        ],
+        "init": (
             "$ErrorActionPreference='Stop'; "
             "[Console]::OutputEncoding=[System.Text.Encoding]::UTF8; "
-            "$OutputEncoding=[System.Text.Encoding]::UTF8; "
-            f"{invocation} *>&1 | Out-String"
+            "$OutputEncoding=[System.Text.Encoding]::UTF8\n"
         ),
-    ]
-
-    start = time.time()
-    proc = subprocess.run(
-        cmd,
-        cwd=str(REPO_ROOT),
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        timeout=timeout,
-    )
-    elapsed_ms = int((time.time() - start) * 1000)
+        "request": powershell_worker_request,
+    },
+}
 
-    output = (proc.stdout or "").strip()
-    error = (proc.stderr or "").strip()
-    combined = output
-    if error:
-        combined = f"{output}\n{error}".strip()
 
-    return {
-        "ok": proc.returncode == 0,
-        "exitCode": proc.returncode,
-        "elapsedMs": elapsed_ms,
-        "output": combined,
-    }
+class ScriptWorker:
+    """Long-lived interpreter that runs scripts over a stdin/stdout line protocol.
 
+    Each request is written as one command line; the script output goes to a
+    per-request file and the worker then prints a sentinel line carrying the
+    request token and exit code. The process is restarted lazily after a crash
+    and killed on timeout.
+    """
 
-def run_shell_script(
+    def __init__(
+        self,
+        cmd: list[str],
+        build_request: Callable[[Path, list[str], str, Path], str],
+        init: str = "",
+    ) -> None:
+        self._cmd = cmd
+        self._build_request = build_request
+        self._init = init
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen[str] | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._output_dir: Path | None = None
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    def _start(self) -> None:
+        proc = subprocess.Popen(
+            self._cmd,
+            cwd=str(REPO_ROOT),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            start_new_session=os.name != "nt",
+        )
+        lines: queue.Queue[str | None] = queue.Queue()
+
+        def pump() -> None:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=pump, daemon=True).start()
+        self._proc = proc
+        self._lines = lines
+        if self._init:
+            self._send(self._init)
+
+    def _send(self, text: str) -> None:
+        assert self._proc is not None and self._proc.stdin is not None
+        self._proc.stdin.write(text)
+        self._proc.stdin.flush()
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if os.name != "nt":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:  # pragma: no cover - defensive
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill()
+            if self._output_dir is not None:
+                shutil.rmtree(self._output_dir, ignore_errors=True)
+                self._output_dir = None
+
+    def _collect_output(self, output_path: Path) -> str:
+        text = read_text_file(output_path, "")
+        try:
+            output_path.unlink()
+        except OSError:
+            pass
+        return text.strip()
+
+    def run(
+        self, script_path: Path, args: list[str] | None = None, timeout: int = 90
+    ) -> dict[str, Any]:
+        # Waiting for the worker counts against the same deadline as the run.
+        start = time.monotonic()
+        if not self._lock.acquire(timeout=timeout):
+            raise subprocess.TimeoutExpired(self._cmd, timeout)
+        try:
+            return self._run_locked(script_path, list(args or []), timeout, start)
+        finally:
+            self._lock.release()
+
+    def _run_locked(
+        self, script_path: Path, args: list[str], timeout: int, start: float
+    ) -> dict[str, Any]:
+        token = uuid.uuid4().hex
+        if self._output_dir is None:
+            self._output_dir = Path(tempfile.mkdtemp(prefix="auto-company-worker-"))
+        output_path = self._output_dir / f"{token}.out"
+        request = self._build_request(script_path, args, token, output_path)
+
+        if self._proc is None or self._proc.poll() is not None:
+            self._kill()
+            self._start()
+        try:
+            self._send(request)
+        except (BrokenPipeError, OSError):
+            self._kill()
+            self._start()
+            self._send(request)
+
+        # Only sentinels are meaningful on the pipe; anything else is worker noise.
+        marker = f"{WORKER_SENTINEL} {token} "
+        exit_code: int | None = None
+        deadline = start + timeout
+        while exit_code is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._kill()
+                raise subprocess.TimeoutExpired(
+                    self._cmd, timeout, output=self._collect_output(output_path)
+                )
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                # Worker died mid-request; report it and respawn on next call.
+                assert self._proc is not None
+                code = self._proc.wait()
+                self._proc = None
+                exit_code = code if code else 1
+                break
+            if line.startswith(marker):
+                value = line[len(marker) :].strip()
+                exit_code = int(value) if value.lstrip("-").isdigit() else 1
+                break
+
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        return {
+            "ok": exit_code == 0,
+            "exitCode": exit_code,
+            "elapsedMs": elapsed_ms,
+            "output": self._collect_output(output_path),
+        }
+
+
+_WORKERS: dict[tuple[str, str], ScriptWorker] = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def worker_lane(script_path: Path) -> str:
+    # Status probes get their own worker so they never queue behind start/stop.
+    if script_path in {WINDOWS_STATUS_SCRIPT, MACOS_STATUS_SCRIPT}:
+        return STATUS_LANE
+    return ACTION_LANE
+
+
+def get_script_worker(kind: str, lane: str = STATUS_LANE) -> ScriptWorker:
+    with _WORKERS_LOCK:
+        worker = _WORKERS.get((kind, lane))
+        if worker is None:
+            spec = WORKER_SPECS[kind]
+            worker = ScriptWorker(spec["cmd"], spec["request"], init=spec["init"])
+            _WORKERS[(kind, lane)] = worker
+        return worker
+
+
+def shutdown_script_workers() -> None:
+    with _WORKERS_LOCK:
+        workers = list(_WORKERS.values())
+        _WORKERS.clear()
+    for worker in workers:
+        worker.close()
+
+
+def run_powershell_script(
     script_path: Path, args: list[str] | None = None, timeout: int = 90
 ) -> dict[str, Any]:
-    cmd = ["/bin/bash", str(script_path)]
-    if args:
-        cmd.extend(args)
-
-    start = time.time()
-    proc = subprocess.run(
-        cmd,
-        cwd=str(REPO_ROOT),
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        timeout=timeout,
-    )
-    elapsed_ms = int((time.time() - start) * 1000)
+    worker = get_script_worker(POWERSHELL_WORKER, worker_lane(script_path))
+    return worker.run(script_path, args, timeout=timeout)
 
-    output = (proc.stdout or "").strip()
-    error = (proc.stderr or "").strip()
-    combined = output
-    if error:
-        combined = f"{output}\n{error}".strip()
 
-    return {
-        "ok": proc.returncode == 0,
-        "exitCode": proc.returncode,
-        "elapsedMs": elapsed_ms,
-        "output": combined,
-    }
+def run_shell_script(
+    script_path: Path, args: list[str] | None = None, timeout: int = 90
+) -> dict[str, Any]:
+    worker = get_script_worker(BASH_WORKER, worker_lane(script_path))
+    return worker.run(script_path, args, timeout=timeout)
 
 
 def get_host_profile(system_name: str | None = None) -> dict[str, Any]:
@@ -431,6 +666,145 @@ def gather_status_payload(system_name: str | None = None) -> dict[str, Any]:
     }
 
 
+def write_status_snapshot(payload: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def load_status_snapshot(path: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or "timestamp" not in payload:
+        return None
+    return payload
+
+
+def error_status_payload(message: str) -> dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "ok": False,
+        "exitCode": None,
+        "elapsedMs": None,
+        "raw": "",
+        "parsed": blank_parsed(),
+        "stateFile": {},
+        "consensusHead": "",
+        "logTail": "",
+        "stale": True,
+        "staleAgeSeconds": None,
+        "error": message,
+    }
+
+
+def payload_age_seconds(payload: dict[str, Any]) -> int | None:
+    try:
+        collected = datetime.fromisoformat(str(payload.get("timestamp")))
+    except ValueError:
+        return None
+    if collected.tzinfo is None:
+        collected = collected.replace(tzinfo=timezone.utc)
+    return max(0, int((datetime.now(timezone.utc) - collected).total_seconds()))
+
+
+class StatusCache:
+    """Last status payload, persisted to disk and served stale while refreshing.
+
+    A request that finds a refresh already in flight gets the previous payload
+    (marked ``stale`` with its age) instead of queueing behind the status script.
+    A payload collected within ``STATUS_FRESH_SECONDS`` is reused, so the result
+    of a background refresh is not thrown away by the next poll.
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], dict[str, Any]] | None = None,
+        snapshot_path: Path | None = None,
+    ) -> None:
+        self._collect = collect or (lambda: gather_status_payload())
+        self._snapshot_path = snapshot_path or STATUS_SNAPSHOT_FILE
+        self._refresh_lock = threading.Lock()
+        self._payload: dict[str, Any] | None = None
+        self._collected_at: float | None = None
+        self._generation = 0
+        self._last_error = ""
+
+    def warm_start(self) -> None:
+        snapshot = load_status_snapshot(self._snapshot_path)
+        if snapshot is not None and self._payload is None:
+            self._payload = snapshot
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            try:
+                self._refresh_locked()
+            except Exception:  # pragma: no cover - defensive
+                pass
+
+    def expire(self) -> None:
+        # Called after start/stop so the next poll sees the new state.
+        self._collected_at = None
+
+    def get(self) -> dict[str, Any]:
+        payload, collected_at = self._payload, self._collected_at
+        if (
+            payload is not None
+            and collected_at is not None
+            and time.monotonic() - collected_at < STATUS_FRESH_SECONDS
+        ):
+            return {**payload, "stale": False}
+        generation = self._generation
+        if not self._refresh_lock.acquire(blocking=False):
+            cached = self._payload
+            if cached is not None:
+                return self._stale(cached)
+            self._refresh_lock.acquire()
+            try:
+                if self._generation != generation and self._payload is not None:
+                    return {**self._payload, "stale": False}
+                # The refresh we waited on failed; don't run the script again.
+                return error_status_payload(self._last_error or "status refresh failed")
+            finally:
+                self._refresh_lock.release()
+        try:
+            return self._refresh_locked()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_locked(self) -> dict[str, Any]:
+        try:
+            payload = self._collect()
+        except Exception as exc:
+            self._last_error = str(exc) or type(exc).__name__
+            if self._payload is None:
+                return error_status_payload(self._last_error)
+            return {**self._stale(self._payload), "error": self._last_error}
+        self._payload = payload
+        self._collected_at = time.monotonic()
+        self._generation += 1
+        self._last_error = ""
+        try:
+            write_status_snapshot(payload, self._snapshot_path)
+        except OSError:
+            pass
+        return {**payload, "stale": False}
+
+    def _stale(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return {**payload, "stale": True, "staleAgeSeconds": payload_age_seconds(payload)}
+
+
+STATUS_CACHE = StatusCache()
+
+
 class DashboardHandler(BaseHTTPRequestHandler):
     def _json(self, payload: dict[str, Any], code: int = 200) -> None:
         raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
@@ -478,7 +852,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
             self._serve_file(DASHBOARD_DIR / "favicon.svg", "image/svg+xml")
             return
         if path == "/api/status":
-            self._json(gather_status_payload())
+            self._json(STATUS_CACHE.get())
             return
         if path == "/api/log-tail":
             qs = parse_qs(parsed.query)
@@ -503,6 +877,8 @@ class DashboardHandler(BaseHTTPRequestHandler):
 
         action = path.rsplit("/", 1)[-1]
         result = run_dashboard_action(action)
+        if action != "refresh":
+            STATUS_CACHE.expire()
         payload = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "action": action,
@@ -529,6 +905,7 @@ def main() -> None:
         print(f"[dashboard] {exc}")
         raise SystemExit(1) from exc
 
+    STATUS_CACHE.warm_start()
     server = ThreadingHTTPServer((args.host, args.port), DashboardHandler)
     print(f"[dashboard] serving on http://{args.host}:{args.port}")
     print(f"[dashboard] repo: {REPO_ROOT}")
@@ -539,6 +916,7 @@ def main() -> None:
         pass
     finally:
         server.server_close()
+        shutdown_script_workers()
         print("[dashboard] stopped")
 
 
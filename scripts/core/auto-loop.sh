@@ -30,6 +30,12 @@
 #   MAX_LOGS=200                # Max cycle logs to keep
 #   AUTO_LOOP_PROTECT_GITIGNORE=1
 #                               # Restore .gitignore if a cycle mutates it
+#   CONSENSUS_BUDGET_BYTES=24000
+#                               # Max consensus bytes injected per cycle (0 = no compaction)
+#   CONSENSUS_BUDGET_TOKENS=    # Optional token budget; overrides bytes. Rough conversion at
+#                               # 3 bytes/token (CJK-heavy UTF-8); English gets fewer tokens
+#   PROMPT_STDIN_THRESHOLD_BYTES=65536
+#                               # Prompts larger than this go via stdin instead of argv
 # ============================================================
 
 set -euo pipefail
@@ -60,8 +66,31 @@ COOLDOWN_SECONDS="${COOLDOWN_SECONDS:-300}"
 LIMIT_WAIT_SECONDS="${LIMIT_WAIT_SECONDS:-3600}"
 MAX_LOGS="${MAX_LOGS:-200}"
 AUTO_LOOP_PROTECT_GITIGNORE="${AUTO_LOOP_PROTECT_GITIGNORE:-1}"
+CONSENSUS_BUDGET_BYTES="${CONSENSUS_BUDGET_BYTES:-24000}"
+CONSENSUS_BUDGET_TOKENS="${CONSENSUS_BUDGET_TOKENS:-}"
+PROMPT_STDIN_THRESHOLD_BYTES="${PROMPT_STDIN_THRESHOLD_BYTES:-65536}"
 RESOLVED_ENGINE_BIN=""
 
+# Rough bytes-per-token factor. PROMPT.md and consensus.md are mostly Chinese,
+# where UTF-8 runs about 3 bytes per token; erring low keeps token budgets honest.
+BYTES_PER_TOKEN=3
+
+if [ -n "$CONSENSUS_BUDGET_TOKENS" ]; then
+    CONSENSUS_BUDGET_BYTES=$((CONSENSUS_BUDGET_TOKENS * BYTES_PER_TOKEN))
+fi
+
+# Per-cycle prompt metrics (persisted to the state file)
+PROMPT_BYTES=0
+PROMPT_TOKENS_EST=0
+CONSENSUS_BYTES=0
+CONSENSUS_COMPACTED=0
+PROMPT_TRANSPORT="argv"
+
+# Static prompt prefix cache (PROMPT.md + runtime guardrails)
+PROMPT_CACHE=""
+PROMPT_CACHE_STAMP=""
+CYCLE_PROMPT_FILE=""
+
 if [ "$ENGINE" != "claude" ] && [ "$ENGINE" != "codex" ]; then
     echo "Error: ENGINE must be 'claude' or 'codex' (received: '$ENGINE')."
     exit 1
@@ -118,12 +147,19 @@ LAST_RUN=$(date '+%Y-%m-%d %H:%M:%S')
 STATUS=$1
 MODEL=$MODEL_LABEL
 ENGINE=$ENGINE
+PROMPT_BYTES=$PROMPT_BYTES
+PROMPT_TOKENS_EST=$PROMPT_TOKENS_EST
+CONSENSUS_BYTES=$CONSENSUS_BYTES
+CONSENSUS_COMPACTED=$CONSENSUS_COMPACTED
+PROMPT_TRANSPORT=$PROMPT_TRANSPORT
 EOF
 }
 
 cleanup() {
     log "=== Auto Loop Shutting Down (PID $$) ==="
     rm -f "$PID_FILE"
+    [ -n "$PROMPT_CACHE_STAMP" ] && rm -f "$PROMPT_CACHE_STAMP"
+    [ -n "$CYCLE_PROMPT_FILE" ] && rm -f "$CYCLE_PROMPT_FILE"
     save_state "stopped"
     exit 0
 }
@@ -287,6 +323,164 @@ consensus_changed_since_backup() {
     return 0
 }
 
+load_static_prompt() {
+    # PROMPT.md rarely changes; the stamp carries its mtime from the last load,
+    # so the freshness check is a fork-free builtin test.
+    if [ -n "$PROMPT_CACHE" ] && [ -f "$PROMPT_CACHE_STAMP" ] && ! [ "$PROMPT_FILE" -nt "$PROMPT_CACHE_STAMP" ]; then
+        return
+    fi
+
+    PROMPT_CACHE="$(cat "$PROMPT_FILE")
+
+---
+
+## Runtime Guardrails (must follow)
+
+1. Early in the cycle, create or update \`memories/consensus.md\` with the required section skeleton.
+2. If work scope is large, persist partial decisions to \`memories/consensus.md\` before deep dives.
+3. Prefer shipping one completed milestone over broad parallel exploration.
+4. Never write files via shell heredoc (\`cat <<EOF\`). Use \`apply_patch\` for file creates/edits.
+5. Never execute shell lines that begin with \`>\` or \`>=\`; treat them as text and keep them inside markdown/files."
+    if [ -z "$PROMPT_CACHE_STAMP" ]; then
+        PROMPT_CACHE_STAMP=$(mktemp)
+    fi
+    touch -r "$PROMPT_FILE" "$PROMPT_CACHE_STAMP"
+}
+
+compact_consensus() {
+    # Print a section-aware view of consensus.md that fits the byte budget.
+    # Every section keeps its heading and its newest (trailing) lines, since
+    # the template's sections grow by appending. Core sections are filled
+    # first and kept whole when they fit; the remainder is shared fairly
+    # across the other sections (small ones keep everything and pass the
+    # unused share on). Text before the first "## " heading counts as a
+    # trimmable section, so a heading-less file is still capped.
+    local budget="$1"
+    LC_ALL=C awk -v budget="$budget" '
+        function fill(grp, avail,    i, left, changed, share, used, j, row) {
+            left = 0
+            for (i = 0; i <= n; i++) {
+                active[i] = (group[i] == grp && body[i] > 0)
+                if (active[i]) left++
+            }
+            changed = 1
+            while (left > 0 && changed) {
+                changed = 0
+                share = avail / left
+                for (i = 0; i <= n; i++) {
+                    if (!active[i] || body[i] > share) continue
+                    from[i] = lo[i]
+                    avail -= body[i]
+                    active[i] = 0
+                    left--
+                    changed = 1
+                }
+            }
+            for (i = 0; i <= n && left > 0; i++) {
+                if (!active[i]) continue
+                share = int(avail / left)
+                used = 0
+                for (j = count[i]; j >= lo[i]; j--) {
+                    row = length(lines[i, j]) + 1
+                    if (used + row > share) break
+                    used += row
+                    from[i] = j
+                }
+                avail -= used
+                left--
+            }
+            return avail
+        }
+        BEGIN {
+            n = 0
+            core["## Last Updated"] = 1
+            core["## Current Phase"] = 1
+            core["## Next Action"] = 1
+            core["## Company State"] = 1
+            core["## Active Projects"] = 1
+        }
+        /^## / { n++; title[n] = $0 }
+        {
+            lines[n, ++count[n]] = $0
+            size[n] += length($0) + 1
+        }
+        END {
+            remaining = budget
+            core_body = 0
+            for (i = 0; i <= n; i++) {
+                lo[i] = (i > 0) ? 2 : 1
+                from[i] = count[i] + 1
+                body[i] = size[i]
+                group[i] = (i > 0 && (title[i] in core)) ? "core" : "rest"
+                if (i > 0) {
+                    body[i] -= length(lines[i, 1]) + 1
+                    remaining -= length(lines[i, 1]) + 1
+                }
+                if (group[i] == "core") core_body += body[i]
+            }
+            if (remaining < 0) remaining = 0
+
+            core_capped = (core_body > remaining)
+            remaining = fill("core", remaining)
+            fill("rest", remaining)
+
+            omitted = 0
+            for (i = 0; i <= n; i++) {
+                if (i > 0) print lines[i, 1]
+                if (from[i] > lo[i]) {
+                    print "- ... (" from[i] - lo[i] " older lines omitted)"
+                    omitted += from[i] - lo[i]
+                }
+                for (j = from[i]; j <= count[i]; j++) print lines[i, j]
+                if (from[i] > count[i] && count[i] >= lo[i]) print ""
+            }
+            if (core_capped) {
+                print "> Warning: core sections alone exceed the prompt budget and were trimmed too."
+            }
+            if (omitted > 0) {
+                print "> Compacted view: " omitted " older lines omitted to fit the prompt budget. Read `memories/consensus.md` only if the omitted history is needed."
+            }
+        }
+    ' "$CONSENSUS_FILE"
+}
+
+build_cycle_prompt() {
+    # Assemble the cycle prompt into a file and record its size metrics.
+    local prompt_file="$1"
+    local consensus
+    local consensus_heading="Current Consensus (pre-loaded, do NOT re-read this file)"
+
+    load_static_prompt
+
+    CONSENSUS_BYTES=$(get_file_size_bytes "$CONSENSUS_FILE")
+    CONSENSUS_COMPACTED=0
+    if [ ! -f "$CONSENSUS_FILE" ]; then
+        consensus="No consensus file found. This is the very first cycle."
+    elif [ "$CONSENSUS_BUDGET_BYTES" -gt 0 ] && [ "$CONSENSUS_BYTES" -gt "$CONSENSUS_BUDGET_BYTES" ]; then
+        consensus=$(compact_consensus "$CONSENSUS_BUDGET_BYTES")
+        CONSENSUS_COMPACTED=1
+        case "$consensus" in
+            *"> Warning: core sections alone exceed"*)
+                log_cycle "$loop_count" "PROMPT" "Core consensus sections exceed ${CONSENSUS_BUDGET_BYTES}-byte budget; trimmed them too"
+                ;;
+        esac
+        consensus_heading="Current Consensus (pre-loaded, compacted to fit the prompt budget)"
+    else
+        consensus=$(cat "$CONSENSUS_FILE")
+    fi
+
+    printf '%s\n\n---\n\n## %s\n\n%s\n\n---\n\nThis is Cycle #%s. Act decisively.\n' \
+        "$PROMPT_CACHE" "$consensus_heading" "$consensus" "$loop_count" > "$prompt_file"
+
+    PROMPT_BYTES=$(get_file_size_bytes "$prompt_file")
+    PROMPT_TOKENS_EST=$(( (PROMPT_BYTES + BYTES_PER_TOKEN - 1) / BYTES_PER_TOKEN ))
+    if [ "$PROMPT_BYTES" -gt "$PROMPT_STDIN_THRESHOLD_BYTES" ]; then
+        PROMPT_TRANSPORT="stdin"
+    else
+        PROMPT_TRANSPORT="argv"
+    fi
+}
+
 resolve_codex_bin() {
     if [ -n "$CODEX_BIN" ]; then
         if [ -x "$CODEX_BIN" ]; then
@@ -384,7 +578,7 @@ resolve_engine_bin() {
 }
 
 run_codex_cycle() {
-    local prompt="$1"
+    local prompt_file="$1"
     local output_file timeout_flag message_file
 
     output_file=$(mktemp)
@@ -398,8 +592,13 @@ run_codex_cycle() {
         if [ -n "$MODEL" ]; then
             codex_cmd+=("-m" "$MODEL")
         fi
-        codex_cmd+=("$prompt")
-        "${codex_cmd[@]}"
+        if [ "$PROMPT_TRANSPORT" = "stdin" ]; then
+            codex_cmd+=("-")
+            "${codex_cmd[@]}" < "$prompt_file"
+        else
+            codex_cmd+=("$(cat "$prompt_file")")
+            "${codex_cmd[@]}"
+        fi
     ) > "$output_file" 2>&1 &
     local codex_pid=$!
 
@@ -435,7 +634,7 @@ run_codex_cycle() {
 }
 
 run_claude_cycle() {
-    local prompt="$1"
+    local prompt_file="$1"
     local output_file timeout_flag
 
     output_file=$(mktemp)
@@ -444,14 +643,22 @@ run_claude_cycle() {
     set +e
     (
         cd "$PROJECT_DIR" || exit 1
-        local claude_cmd=("$RESOLVED_ENGINE_BIN" "-p" "$prompt" "--output-format" "json")
+        local claude_cmd=("$RESOLVED_ENGINE_BIN" "-p")
+        if [ "$PROMPT_TRANSPORT" != "stdin" ]; then
+            claude_cmd+=("$(cat "$prompt_file")")
+        fi
+        claude_cmd+=("--output-format" "json")
         if [ -n "$MODEL" ]; then
             claude_cmd+=("--model" "$MODEL")
         fi
         if [ -n "$CLAUDE_PERMISSION_MODE" ]; then
             claude_cmd+=("--permission-mode" "$CLAUDE_PERMISSION_MODE")
         fi
-        "${claude_cmd[@]}"
+        if [ "$PROMPT_TRANSPORT" = "stdin" ]; then
+            "${claude_cmd[@]}" < "$prompt_file"
+        else
+            "${claude_cmd[@]}"
+        fi
     ) > "$output_file" 2>&1 &
     local claude_pid=$!
 
@@ -487,13 +694,13 @@ run_claude_cycle() {
 }
 
 run_engine_cycle() {
-    local prompt="$1"
+    local prompt_file="$1"
     case "$ENGINE" in
         claude)
-            run_claude_cycle "$prompt"
+            run_claude_cycle "$prompt_file"
             ;;
         codex)
-            run_codex_cycle "$prompt"
+            run_codex_cycle "$prompt_file"
             ;;
         *)
             echo "Error: Unsupported ENGINE '$ENGINE'" >&2
@@ -624,6 +831,7 @@ if [ -n "$engine_version" ]; then
     fi
 fi
 log "Interval: ${LOOP_INTERVAL}s | Timeout: ${CYCLE_TIMEOUT_SECONDS}s | Breaker: ${MAX_CONSECUTIVE_ERRORS} errors"
+log "Prompt: consensus budget ${CONSENSUS_BUDGET_BYTES} bytes | stdin above ${PROMPT_STDIN_THRESHOLD_BYTES} bytes"
 
 # === Main Loop ===
 
@@ -647,33 +855,20 @@ while true; do
     backup_consensus
     gitignore_snapshot=$(snapshot_gitignore)
 
-    # Build prompt with consensus pre-injected
-    PROMPT=$(cat "$PROMPT_FILE")
-    CONSENSUS=$(cat "$CONSENSUS_FILE" 2>/dev/null || echo "No consensus file found. This is the very first cycle.")
-    FULL_PROMPT="$PROMPT
-
----
-
-## Runtime Guardrails (must follow)
-
-1. Early in the cycle, create or update \`memories/consensus.md\` with the required section skeleton.
-2. If work scope is large, persist partial decisions to \`memories/consensus.md\` before deep dives.
-3. Prefer shipping one completed milestone over broad parallel exploration.
-4. Never write files via shell heredoc (\`cat <<EOF\`). Use \`apply_patch\` for file creates/edits.
-5. Never execute shell lines that begin with \`>\` or \`>=\`; treat them as text and keep them inside markdown/files.
-
----
-
-## Current Consensus (pre-loaded, do NOT re-read this file)
-
-$CONSENSUS
-
----
-
-This is Cycle #$loop_count. Act decisively."
+    # Build prompt with consensus pre-injected (compacted to budget)
+    CYCLE_PROMPT_FILE=$(mktemp)
+    build_cycle_prompt "$CYCLE_PROMPT_FILE"
+    compact_note=""
+    if [ "$CONSENSUS_COMPACTED" -eq 1 ]; then
+        compact_note=", consensus compacted from ${CONSENSUS_BYTES} bytes"
+    fi
+    log_cycle "$loop_count" "PROMPT" "${PROMPT_BYTES} bytes (~${PROMPT_TOKENS_EST} tokens) via ${PROMPT_TRANSPORT}${compact_note}"
+    save_state "running"
 
     # Run selected engine in headless mode with per-cycle timeout
-    run_engine_cycle "$FULL_PROMPT"
+    run_engine_cycle "$CYCLE_PROMPT_FILE"
+    rm -f "$CYCLE_PROMPT_FILE"
+    CYCLE_PROMPT_FILE=""
 
     # Save full output to cycle log
     echo "$OUTPUT" > "$cycle_log"
@@ -11,6 +11,9 @@ param(
     [int]$CooldownSeconds,
     [int]$LimitWaitSeconds,
     [int]$MaxLogs,
+    [int]$ConsensusBudgetBytes,
+    [int]$ConsensusBudgetTokens,
+    [int]$PromptStdinThresholdBytes,
     [string]$SandboxMode,
     [string]$CodexSandboxMode
 )
@@ -107,6 +110,9 @@ if ($PSBoundParameters.ContainsKey("MaxConsecutiveErrors")) { $envLines += "MAX_
 if ($PSBoundParameters.ContainsKey("CooldownSeconds")) { $envLines += "COOLDOWN_SECONDS=$CooldownSeconds" }
 if ($PSBoundParameters.ContainsKey("LimitWaitSeconds")) { $envLines += "LIMIT_WAIT_SECONDS=$LimitWaitSeconds" }
 if ($PSBoundParameters.ContainsKey("MaxLogs")) { $envLines += "MAX_LOGS=$MaxLogs" }
+if ($PSBoundParameters.ContainsKey("ConsensusBudgetBytes")) { $envLines += "CONSENSUS_BUDGET_BYTES=$ConsensusBudgetBytes" }
+if ($PSBoundParameters.ContainsKey("ConsensusBudgetTokens")) { $envLines += "CONSENSUS_BUDGET_TOKENS=$ConsensusBudgetTokens" }
+if ($PSBoundParameters.ContainsKey("PromptStdinThresholdBytes")) { $envLines += "PROMPT_STDIN_THRESHOLD_BYTES=$PromptStdinThresholdBytes" }
 if ($PSBoundParameters.ContainsKey("SandboxMode")) {
     $envLines += "CODEX_SANDBOX_MODE=$SandboxMode"
 } elseif ($PSBoundParameters.ContainsKey("CodexSandboxMode")) {
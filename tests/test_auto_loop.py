@@ -0,0 +1,91 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+
+AUTO_LOOP_PATH = Path(__file__).resolve().parents[1] / "scripts" / "core" / "auto-loop.sh"
+
+
+def extract_function(name: str) -> str:
+    text = AUTO_LOOP_PATH.read_text(encoding="utf-8")
+    start = text.index(f"{name}() {{")
+    end = text.index("\n}\n", start) + 3
+    return text[start:end]
+
+
+@unittest.skipUnless(shutil.which("bash") and shutil.which("awk"), "needs bash and awk")
+class CompactConsensusTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.consensus = Path(self.tmp.name) / "consensus.md"
+
+    def compact(self, text: str, budget: int) -> str:
+        self.consensus.write_text(text, encoding="utf-8")
+        script = extract_function("compact_consensus") + '\ncompact_consensus "$1"\n'
+        proc = subprocess.run(
+            ["bash", "-c", script, "compact", str(budget)],
+            env={"CONSENSUS_FILE": str(self.consensus), "PATH": "/usr/bin:/bin"},
+            capture_output=True,
+            check=True,
+        )
+        return proc.stdout.decode("utf-8")
+
+    @staticmethod
+    def section(title: str, rows: list[str]) -> str:
+        return f"## {title}\n" + "".join(f"{row}\n" for row in rows) + "\n"
+
+    def template(self, core_rows: int = 1, grown_rows: int = 400) -> str:
+        grown = lambda label: [f"- {label} {i}: 决策与理由 long enough text" for i in range(grown_rows)]
+        return (
+            "# Auto Company Consensus\n\n"
+            + self.section("Last Updated", ["2026-10-19"])
+            + self.section("Current Phase", ["Building"])
+            + self.section("What We Did This Cycle", grown("did"))
+            + self.section("Key Decisions Made", grown("decision"))
+            + self.section("Active Projects", [f"- project {i}: shipping" for i in range(core_rows)])
+            + self.section("Next Action", ["Ship the MVP"])
+            + self.section("Company State", ["- Revenue: $0"])
+            + self.section("Open Questions", grown("question"))
+        )
+
+    def test_budget_is_shared_and_newest_lines_are_kept(self) -> None:
+        budget = 12000
+        out = self.compact(self.template(), budget)
+        self.assertLessEqual(len(out.encode("utf-8")), budget + 600)
+        for label, title in (
+            ("did", "What We Did This Cycle"),
+            ("decision", "Key Decisions Made"),
+            ("question", "Open Questions"),
+        ):
+            self.assertIn(f"## {title}\n- ... (", out)
+            self.assertIn(f"- {label} 399:", out)
+            self.assertNotIn(f"- {label} 0:", out)
+        kept = [out.count(f"- {label} ") for label in ("did", "decision", "question")]
+        # Equal byte shares; line counts differ only by label length.
+        self.assertGreater(min(kept), 0.8 * max(kept))
+        self.assertIn("Ship the MVP", out)
+        self.assertIn("- Revenue: $0", out)
+        self.assertIn("older lines omitted to fit the prompt budget", out)
+        self.assertNotIn("Warning", out)
+
+    def test_oversized_core_sections_are_capped(self) -> None:
+        budget = 4000
+        out = self.compact(self.template(core_rows=2000, grown_rows=10), budget)
+        self.assertLessEqual(len(out.encode("utf-8")), budget + 800)
+        self.assertIn("- project 1999: shipping", out)
+        self.assertIn("core sections alone exceed the prompt budget", out)
+        self.assertIn("## Key Decisions Made\n", out)
+
+    def test_heading_less_file_is_capped(self) -> None:
+        budget = 2000
+        out = self.compact("".join(f"note {i}\n" for i in range(5000)), budget)
+        self.assertLessEqual(len(out.encode("utf-8")), budget + 300)
+        self.assertIn("note 4999\n", out)
+        self.assertNotIn("note 0\n", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
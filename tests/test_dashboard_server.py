@@ -1,4 +1,10 @@
+import base64
 import importlib.util
+import os
+import subprocess
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -191,5 +197,274 @@ Raw=Loop not running
             dashboard_server.detect_host_kind("Linux")
 
 
+class ScriptWorkerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        spec = dashboard_server.WORKER_SPECS[dashboard_server.BASH_WORKER]
+        self.worker = dashboard_server.ScriptWorker(spec["cmd"], spec["request"])
+        self.addCleanup(self.worker.close)
+
+    def write_script(self, name: str, body: str) -> Path:
+        path = Path(self.tmp.name) / name
+        path.write_text(body, encoding="utf-8")
+        return path
+
+    def test_bash_worker_runs_script_with_args_and_exit_code(self) -> None:
+        script = self.write_script(
+            "echo.sh",
+            'SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"\n'
+            'echo "dir=$SCRIPT_DIR"\n'
+            'echo "args=$1|$2"\n'
+            'echo "oops" >&2\n'
+            "exit 3\n",
+        )
+        result = self.worker.run(script, args=["a b", "it's"], timeout=10)
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["exitCode"], 3)
+        self.assertIn(f"dir={Path(self.tmp.name).resolve()}", result["output"])
+        self.assertIn("args=a b|it's", result["output"])
+        self.assertIn("oops", result["output"])
+
+    def test_bash_worker_is_reused_across_requests(self) -> None:
+        script = self.write_script("ok.sh", "echo ok\n")
+        first = self.worker.run(script, timeout=10)
+        pid = self.worker.pid
+        second = self.worker.run(script, timeout=10)
+        self.assertTrue(first["ok"])
+        self.assertEqual(second["output"], "ok")
+        self.assertEqual(self.worker.pid, pid)
+
+    def test_bash_worker_restarts_after_crash(self) -> None:
+        script = self.write_script("ok.sh", "echo ok\n")
+        self.worker.run(script, timeout=10)
+        pid = self.worker.pid
+        assert pid is not None
+        os.kill(pid, 9)
+        proc = self.worker._proc
+        assert proc is not None
+        deadline = time.time() + 10
+        while proc.poll() is None and time.time() < deadline:
+            time.sleep(0.01)
+        result = self.worker.run(script, timeout=10)
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["output"], "ok")
+        self.assertNotEqual(self.worker.pid, pid)
+
+    def test_bash_worker_crash_mid_request_reports_failure(self) -> None:
+        # $$ in the request subshell is the worker shell itself.
+        crash = self.write_script("crash.sh", "echo before\nkill -9 $$\n")
+        ok = self.write_script("ok.sh", "echo ok\n")
+        result = self.worker.run(crash, timeout=10)
+        self.assertFalse(result["ok"])
+        self.assertNotEqual(result["exitCode"], 0)
+        self.assertIn("before", result["output"])
+        self.assertIsNone(self.worker.pid)
+        self.assertTrue(self.worker.run(ok, timeout=10)["ok"])
+
+    def test_background_output_does_not_leak_into_later_requests(self) -> None:
+        leaky = self.write_script(
+            "leaky.sh", "(sleep 0.5; echo late-from-bg) &\necho first\n"
+        )
+        slow = self.write_script("slow.sh", "sleep 1\necho ok\n")
+        self.assertEqual(self.worker.run(leaky, timeout=10)["output"], "first")
+        self.assertEqual(self.worker.run(slow, timeout=10)["output"], "ok")
+
+    def test_lock_wait_counts_against_timeout(self) -> None:
+        hang = self.write_script("hang.sh", "sleep 30\n")
+        ok = self.write_script("ok.sh", "echo ok\n")
+        blocker = threading.Thread(
+            target=lambda: self.assertRaises(
+                subprocess.TimeoutExpired, self.worker.run, hang, timeout=2
+            )
+        )
+        blocker.start()
+        time.sleep(0.2)
+        started = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.worker.run(ok, timeout=1)
+        self.assertLess(time.monotonic() - started, 1.5)
+        blocker.join()
+
+    def test_status_and_actions_use_separate_workers(self) -> None:
+        status = dashboard_server.get_script_worker(
+            dashboard_server.BASH_WORKER,
+            dashboard_server.worker_lane(dashboard_server.MACOS_STATUS_SCRIPT),
+        )
+        action = dashboard_server.get_script_worker(
+            dashboard_server.BASH_WORKER,
+            dashboard_server.worker_lane(dashboard_server.MACOS_STOP_SCRIPT),
+        )
+        self.addCleanup(dashboard_server.shutdown_script_workers)
+        self.assertIsNot(status, action)
+
+    def test_powershell_request_is_ascii_base64_command(self) -> None:
+        script = Path("C:/Users/张三/auto-company/scripts/windows/status-win.ps1")
+        with mock.patch.object(dashboard_server, "REPO_ROOT", Path("C:/Users/张三/auto-company")):
+            request = dashboard_server.powershell_worker_request(
+                script, ["it's", "公司"], "tok123", Path("C:/Temp/张三/tok123.out")
+            )
+        self.assertTrue(request.isascii())
+        self.assertTrue(request.endswith("\n"))
+        prefix = "iex ([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('"
+        self.assertTrue(request.startswith(prefix))
+        encoded = request[len(prefix) : request.index("'", len(prefix))]
+        command = base64.b64decode(encoded).decode("utf-8")
+        # The script runs in a fresh runspace; quotes are doubled once more
+        # because the inner script is itself a single-quoted literal.
+        self.assertIn("$acPs = [PowerShell]::Create()", command)
+        self.assertIn("$acPs.Dispose()", command)
+        self.assertIn("Set-Location -LiteralPath ''C:/Users/张三/auto-company''", command)
+        self.assertIn(
+            "& ''C:/Users/张三/auto-company/scripts/windows/status-win.ps1'' ''it''''s'' ''公司'' *>&1",
+            command,
+        )
+        self.assertIn("[IO.File]::WriteAllText(''C:/Temp/张三/tok123.out''", command)
+        self.assertIn("[Environment]::SetEnvironmentVariable($acKey, $acEnv[$acKey])", command)
+        self.assertIn(f"`n{dashboard_server.WORKER_SENTINEL} tok123 $acCode", command)
+
+    def test_powershell_request_restores_environment_variables(self) -> None:
+        request = dashboard_server.powershell_worker_request(
+            Path("C:/a.ps1"), [], "tok", Path("C:/t/tok.out")
+        )
+        prefix = "iex ([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('"
+        encoded = request[len(prefix) : request.index("'", len(prefix))]
+        command = base64.b64decode(encoded).decode("utf-8")
+        snapshot = command.index("$acEnv = [Environment]::GetEnvironmentVariables()")
+        invoke = command.index("$acPs.Invoke()")
+        restore = command.index("$acNow = [Environment]::GetEnvironmentVariables()")
+        sentinel = command.index(dashboard_server.WORKER_SENTINEL)
+        self.assertLess(snapshot, invoke)
+        self.assertLess(invoke, restore)
+        self.assertLess(restore, sentinel)
+
+    def test_bash_worker_restarts_after_hang(self) -> None:
+        hang = self.write_script("hang.sh", "sleep 30\n")
+        ok = self.write_script("ok.sh", "echo ok\n")
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.worker.run(hang, timeout=1)
+        self.assertIsNone(self.worker.pid)
+        result = self.worker.run(ok, timeout=10)
+        self.assertEqual(result["output"], "ok")
+
+
+class StatusCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.snapshot = Path(self.tmp.name) / "logs" / "dashboard-status.json"
+
+    def test_refresh_persists_snapshot(self) -> None:
+        payload = {"timestamp": "2026-03-14T12:00:00+00:00", "ok": True}
+        cache = dashboard_server.StatusCache(lambda: payload, self.snapshot)
+        result = cache.get()
+        self.assertFalse(result["stale"])
+        self.assertEqual(dashboard_server.load_status_snapshot(self.snapshot), payload)
+        self.assertEqual(list(self.snapshot.parent.iterdir()), [self.snapshot])
+
+    def test_warm_start_serves_snapshot_while_refreshing(self) -> None:
+        dashboard_server.write_status_snapshot(
+            {"timestamp": "2026-03-14T12:00:00+00:00", "ok": True, "raw": "old"},
+            self.snapshot,
+        )
+        release = threading.Event()
+        calls = []
+
+        def collect() -> dict:
+            calls.append(1)
+            release.wait(10)
+            return {"timestamp": "2026-03-14T12:05:00+00:00", "ok": True, "raw": "new"}
+
+        cache = dashboard_server.StatusCache(collect, self.snapshot)
+        cache.warm_start()
+        deadline = time.time() + 10
+        while not calls and time.time() < deadline:
+            time.sleep(0.01)
+        stale = cache.get()
+        self.assertTrue(stale["stale"])
+        self.assertEqual(stale["raw"], "old")
+        self.assertIsInstance(stale["staleAgeSeconds"], int)
+
+        release.set()
+        while (
+            dashboard_server.load_status_snapshot(self.snapshot)["raw"] != "new"
+            and time.time() < deadline
+        ):
+            time.sleep(0.01)
+        # The follow-up poll reuses the background result instead of re-running.
+        fresh = cache.get()
+        self.assertFalse(fresh["stale"])
+        self.assertEqual(fresh["raw"], "new")
+        self.assertEqual(len(calls), 1)
+
+    def test_expired_payload_is_collected_again(self) -> None:
+        calls = []
+
+        def collect() -> dict:
+            calls.append(1)
+            return {"timestamp": "2026-03-14T12:05:00+00:00", "ok": True, "raw": str(len(calls))}
+
+        cache = dashboard_server.StatusCache(collect, self.snapshot)
+        self.assertEqual(cache.get()["raw"], "1")
+        self.assertEqual(cache.get()["raw"], "1")
+        cache.expire()
+        self.assertEqual(cache.get()["raw"], "2")
+        with mock.patch.object(dashboard_server, "STATUS_FRESH_SECONDS", 0):
+            self.assertEqual(cache.get()["raw"], "3")
+
+    def test_failed_refresh_falls_back_to_last_payload(self) -> None:
+        calls = {"count": 0}
+
+        def collect() -> dict:
+            calls["count"] += 1
+            if calls["count"] > 1:
+                raise subprocess.TimeoutExpired(["status"], 90)
+            return {"timestamp": "2026-03-14T12:00:00+00:00", "ok": True}
+
+        cache = dashboard_server.StatusCache(collect, self.snapshot)
+        cache.get()
+        cache.expire()
+        result = cache.get()
+        self.assertTrue(result["stale"])
+        self.assertIn("timed out", result["error"])
+
+    def test_waiter_does_not_recollect_after_failed_refresh(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+        calls = {"count": 0}
+
+        def collect() -> dict:
+            calls["count"] += 1
+            started.set()
+            release.wait(10)
+            raise subprocess.TimeoutExpired(["status"], 90)
+
+        cache = dashboard_server.StatusCache(collect, self.snapshot)
+        cache.warm_start()
+        self.assertTrue(started.wait(10))
+        threading.Timer(0.2, release.set).start()
+        result = cache.get()
+        self.assertEqual(calls["count"], 1)
+        self.assertFalse(result["ok"])
+        self.assertTrue(result["stale"])
+        self.assertIn("timed out", result["error"])
+
+    def test_cold_failure_returns_error_payload(self) -> None:
+        def collect() -> dict:
+            raise subprocess.TimeoutExpired(["status"], 90)
+
+        cache = dashboard_server.StatusCache(collect, self.snapshot)
+        result = cache.get()
+        self.assertFalse(result["ok"])
+        self.assertIn("timed out", result["error"])
+        self.assertEqual(result["parsed"]["loop"]["state"], "unknown")
+        self.assertFalse(self.snapshot.exists())
+
+    def test_corrupt_snapshot_is_ignored(self) -> None:
+        self.snapshot.parent.mkdir(parents=True)
+        self.snapshot.write_text("{not json", encoding="utf-8")
+        self.assertIsNone(dashboard_server.load_status_snapshot(self.snapshot))
+
+
 if __name__ == "__main__":
     unittest.main()